@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 import typing as t
+from io import BytesIO
+from xml.sax.saxutils import escape
+from lxml import etree
 from zeep import Client, Settings
+from zeep.cache import Base as BaseCache, InMemoryCache
+from zeep.exceptions import LookupError as ZeepLookupError
 from zeep.transports import Transport
 from requests import Session
-from zeep.helpers import serialize_object
+from requests.adapters import HTTPAdapter
+from zeep.xsd import AnySimpleType, CompoundValue, Element, Sequence
 import logging
 
 # Set up logging: only show warnings or above for zeep and its submodules
@@ -20,6 +26,83 @@ logging.getLogger("requests").setLevel(logging.WARNING)
 if t.TYPE_CHECKING:
     from singer_sdk.helpers.types import Context
 
+# SOAP 1.2 binding and endpoint used for all Sherpa service calls
+SERVICE_BINDING = "{http://sherpa.sherpaan.nl/}SherpaServiceSoap12"
+SERVICE_ADDRESS = "https://sherpaservices-tst.sherpacloud.eu/214/Sherpa.asmx"
+SHERPA_NAMESPACE = "http://sherpa.sherpaan.nl/"
+RESPONSE_TIME_TAG = f"{{{SHERPA_NAMESPACE}}}ResponseTime"
+
+# Fixed parts of the SOAP envelope rendered by get_curl_command
+ENVELOPE_HEAD = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope"'
+    ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"'
+    ' xmlns:xsd="http://www.w3.org/2001/XMLSchema">\n'
+    "  <soap:Body>\n"
+)
+ENVELOPE_TAIL = "  </soap:Body>\n</soap:Envelope>"
+# Also escape single quotes, the envelope is embedded in a single-quoted shell argument
+XML_ENTITIES = {"'": "&apos;"}
+
+
+def as_dict(value: t.Any) -> t.Any:
+    """Return the field mapping backing a zeep ``CompoundValue``.
+
+    Unlike ``zeep.helpers.serialize_object`` this does not recurse; nested
+    values are unwrapped only when a caller walks into them.
+
+    Args:
+        value: A zeep response object or any other value
+
+    Returns:
+        The object's field dict, or the value itself if it is not a zeep object
+    """
+    if isinstance(value, CompoundValue):
+        return value.__values__
+    return value
+
+
+def create_transport(
+    timeout: int = 30,
+    pool_maxsize: int = 4,
+    pool_block: bool = False,
+    cache: t.Optional[BaseCache] = None,
+) -> Transport:
+    """Create a zeep transport over a keep-alive session for the Sherpa endpoint.
+
+    Args:
+        timeout: Timeout in seconds for loading the WSDL
+        pool_maxsize: Number of keep-alive connections kept open to the endpoint
+        pool_block: Wait for a free connection instead of opening an extra one
+        cache: Cache for downloaded WSDL and XSD documents, in memory by default
+
+    Returns:
+        The transport
+    """
+    session = Session()
+    # All calls go to one host; keep its connections alive and reuse them
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Set default Content-Type header
+    session.headers.update({
+        "Content-Type": "application/soap+xml; charset=utf-8"
+    })
+    return Transport(session=session, timeout=timeout, cache=cache or InMemoryCache())
+
+
+def create_zeep_client(wsdl_url: str, transport: Transport) -> Client:
+    """Create a zeep client for a WSDL, which loads and parses the WSDL.
+
+    Args:
+        wsdl_url: The WSDL URL for the Sherpa SOAP service
+        transport: Transport the client loads the WSDL and makes calls with
+
+    Returns:
+        The zeep client
+    """
+    return Client(wsdl_url, transport=transport, settings=Settings(strict=False))
+
 
 class SherpaClient:
     """SOAP client for Sherpa API."""
@@ -29,6 +112,9 @@ class SherpaClient:
         wsdl_url: str,
         tap: "TapSherpa",
         timeout: int = 30,
+        pool_maxsize: int = 4,
+        transport: t.Optional[Transport] = None,
+        zeep_client: t.Optional[Client] = None,
     ) -> None:
         """Initialize the Sherpa SOAP client.
 
@@ -36,22 +122,25 @@ class SherpaClient:
             wsdl_url: The WSDL URL for the Sherpa SOAP service
             tap: The tap instance to get configuration from
             timeout: Request timeout in seconds
+            pool_maxsize: Number of keep-alive connections kept open to the endpoint
+            transport: Transport to share with other clients, timeout and pool_maxsize
+                only apply when a new one is created
+            zeep_client: zeep client to share with other clients, so the WSDL is only
+                parsed once; transport, timeout and pool_maxsize are ignored when given
         """
         self.wsdl_url = wsdl_url
-        session = Session()
-        # Set default Content-Type header
-        session.headers.update({
-            "Content-Type": "application/soap+xml; charset=utf-8"
-        })
-        transport = Transport(session=session, timeout=timeout)
-        settings = Settings(strict=False)
-        self.client = Client(
-            wsdl_url,
-            transport=transport,
-            settings=settings,
-        )
+        if zeep_client is None:
+            if transport is None:
+                transport = create_transport(timeout=timeout, pool_maxsize=pool_maxsize)
+            zeep_client = create_zeep_client(wsdl_url, transport)
+        self.client = zeep_client
         self.tap = tap
-        self.session = session  # Save session for dynamic header updates
+        self._security_code = str(tap.config["security_code"])
+        self.session = zeep_client.transport.session  # Save session for dynamic header updates
+        # Bind the service proxy once; it is invariant across calls
+        self.service = self.client.create_service(SERVICE_BINDING, SERVICE_ADDRESS)
+        self._methods: t.Dict[str, t.Callable[..., t.Any]] = {}
+        self._row_parsers: t.Dict[str, t.Optional[t.Callable[[t.Any], dict]]] = {}
 
     def get_curl_command(self, service_name: str, params: dict, stream_name: str = None) -> str:
         """Generate a curl command for the SOAP request.
@@ -66,15 +155,18 @@ class SherpaClient:
         """
         # Add authentication parameters
         params = {
-            "securityCode": self.tap.config["security_code"],
+            "securityCode": self._security_code,
             **params
         }
 
-        # Convert all parameters to strings
-        params = {k: str(v) for k, v in params.items()}
-
-        # Create the SOAP envelope
-        soap_envelope = f"""<?xml version=\"1.0\" encoding=\"utf-8\"?>\n<soap:Envelope xmlns:soap=\"http://www.w3.org/2003/05/soap-envelope\" xmlns:xsi=\"http://www.w3.org/2001/XMLSchema-instance\" xmlns:xsd=\"http://www.w3.org/2001/XMLSchema\">\n  <soap:Body>\n    <{service_name} xmlns=\"http://sherpa.sherpaan.nl/\">\n{chr(10).join(f'      <{k}>{v}</{k}>' for k, v in params.items())}\n    </{service_name}>\n  </soap:Body>\n</soap:Envelope>"""
+        # Create the SOAP envelope, escaping all parameter values
+        soap_envelope = "".join([
+            ENVELOPE_HEAD,
+            f'    <{service_name} xmlns="http://sherpa.sherpaan.nl/">\n',
+            *(f"      <{k}>{escape(str(v), XML_ENTITIES)}</{k}>\n" for k, v in params.items()),
+            f"    </{service_name}>\n",
+            ENVELOPE_TAIL,
+        ])
 
         # Generate the curl command
         curl_cmd = f"""curl -X POST \\\n  '{self.wsdl_url.replace("?wsdl", "")}' \\\n  -H 'Content-Type: application/soap+xml; charset=utf-8' \\\n  -H 'SOAPAction: \"http://sherpa.sherpaan.nl/{service_name}\"' \\\n  -d '{soap_envelope}'"""
@@ -87,51 +179,179 @@ class SherpaClient:
         Args:
             service_name: Name of the SOAP service method to call
             stream_name: Name of the stream (for stream-specific token)
-            **kwargs: Arguments to pass to the service method
+            **kwargs: Arguments to pass to the service method, as strings
 
         Returns:
             Response from the SOAP service
         """
         # Add authentication parameters to all requests
-        kwargs["securityCode"] = self.tap.config["security_code"]
+        kwargs["securityCode"] = self._security_code
 
-        # Ensure all parameters are strings
-        kwargs = {k: str(v) for k, v in kwargs.items()}
+        # Call the service method (no _http_headers)
+        method = self._get_method(service_name)
+        result = method(**kwargs)
+        return as_dict(result)
+
+    def call_service_rows(
+        self,
+        service_name: str,
+        response_path: t.Sequence[str],
+        row_mapper: t.Callable[[dict], t.Any],
+        stream_name: str = None,
+        **kwargs,
+    ) -> t.Tuple[int, list]:
+        """Call a SOAP service method and map the rows of its response while parsing it.
 
+        The raw response is read with ``lxml.etree.iterparse`` and each row
+        element is converted to a field dict, mapped, and then cleared, so the
+        full zeep object tree for the page is never built. Falls back to
+        ``call_service`` when the WSDL has no type named after the row element.
+
+        Args:
+            service_name: Name of the SOAP service method to call
+            response_path: Keys leading from the result to the rows; the last one is the row element name
+            row_mapper: Function applied to the field dict of each row
+            stream_name: Name of the stream (for stream-specific token)
+            **kwargs: Arguments to pass to the service method, as strings
+
+        Returns:
+            Tuple of the response's ResponseTime and the mapped rows
+        """
+        parse_row = self._get_row_parser(response_path[-1])
+        if parse_row is None:
+            response = self.call_service(service_name, stream_name=stream_name, **kwargs)
+            rows = response
+            for part in response_path:
+                rows = as_dict(rows.get(part)) if isinstance(rows, dict) else None
+            if not isinstance(rows, list):
+                rows = []
+            return response.get("ResponseTime", 0), [row_mapper(as_dict(row)) for row in rows]
+
+        content = self._call_service_raw(service_name, **kwargs)
+        row_tag = f"{{{SHERPA_NAMESPACE}}}{response_path[-1]}"
+        response_time = 0
+        rows = []
+        for _, element in etree.iterparse(
+            BytesIO(content), events=("end",), tag=(row_tag, RESPONSE_TIME_TAG)
+        ):
+            if element.tag == RESPONSE_TIME_TAG:
+                response_time = int(element.text) if element.text else 0
+            else:
+                rows.append(row_mapper(parse_row(element)))
+            # Drop parsed elements so only the current row is held in memory
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        return response_time, rows
+
+    def _call_service_raw(self, service_name: str, **kwargs) -> bytes:
+        """Call a SOAP service method and return the unparsed response body.
+
+        Args:
+            service_name: Name of the SOAP service method to call
+            **kwargs: Arguments to pass to the service method, as strings
+
+        Returns:
+            The raw SOAP response body
+
+        Raises:
+            zeep.exceptions.Fault: If the service returned a SOAP fault
+            zeep.exceptions.TransportError: If the service returned an error status
+                without a SOAP envelope
+        """
+        kwargs["securityCode"] = self._security_code
+
+        method = self._get_method(service_name)
+        with self.client.settings(raw_response=True):
+            response = method(**kwargs)
+        if response.status_code != 200:
+            # Let the binding turn the error body into the exception zeep raises itself
+            binding = self.service._binding
+            binding.process_reply(self.client, binding.get(service_name), response)
+            response.raise_for_status()
+        return response.content
+
+    def _get_method(self, service_name: str) -> t.Callable[..., t.Any]:
+        """Get the bound operation for a service and set its SOAPAction header.
+
+        Args:
+            service_name: Name of the SOAP service method
+
+        Returns:
+            The bound zeep operation
+        """
         # Set SOAPAction header dynamically for this call
         soap_action = f'"http://sherpa.sherpaan.nl/{service_name}"'
         self.session.headers["SOAPAction"] = soap_action
 
-        # Get the service and create the operation
-        service = self.client.create_service(
-            '{http://sherpa.sherpaan.nl/}SherpaServiceSoap12',
-            'https://sherpaservices-tst.sherpacloud.eu/214/Sherpa.asmx'
-        )
-        
-        # Call the service method (no _http_headers)
-        method = getattr(service, service_name)
-        result = method(**kwargs)
-        return serialize_object(result)
+        method = self._methods.get(service_name)
+        if method is None:
+            method = self._methods[service_name] = getattr(self.service, service_name)
+        return method
 
-    def get_changed_items(self, token: int) -> list:
-        """Get changed items from the API.
+    def _get_row_parser(self, row_name: str) -> t.Optional[t.Callable[[t.Any], dict]]:
+        """Get a function converting a response row element to a field dict.
+
+        Rows whose XSD type is a plain sequence of single simple-typed fields
+        are converted field by field with each field's type, which gives the
+        same values as zeep's parser without building a ``CompoundValue``.
+        Other row types are parsed by zeep.
 
         Args:
-            token: The token to use for pagination
+            row_name: Local name of the row element, e.g. ItemCodeToken
 
         Returns:
-            List of changed items
+            The parser, or None if the WSDL does not define the row type
         """
-        result = self.call_service("ChangedItems", token=token)
-        if not result or "ChangedItemsResult" not in result:
-            return []
-            
-        response = result["ChangedItemsResult"]
-        if not response or "ResponseValue" not in response:
-            return []
-            
-        items = response["ResponseValue"].get("ItemCodeToken", [])
-        if not isinstance(items, list):
-            items = [items]
-            
-        return items
+        if row_name in self._row_parsers:
+            return self._row_parsers[row_name]
+        try:
+            row_type = self.client.get_type(f"{{{SHERPA_NAMESPACE}}}{row_name}")
+        except ZeepLookupError:
+            self._row_parsers[row_name] = None
+            return None
+        schema = self.client.wsdl.types
+
+        nested = getattr(row_type, "elements_nested", None)
+        if (
+            not nested
+            or len(nested) != 1
+            or not isinstance(nested[0][1], Sequence)
+            or row_type.attributes
+            or not all(
+                isinstance(field, Element)
+                and isinstance(field.type, AnySimpleType)
+                and not field.accepts_multiple
+                for field in nested[0][1]
+            )
+        ):
+            def parse_row(element: t.Any) -> dict:
+                return as_dict(row_type.parse_xmlelement(element, schema))
+
+            self._row_parsers[row_name] = parse_row
+            return parse_row
+
+        names = [name for name, _ in row_type.elements]
+        fields = {field.qname.text: (name, field) for name, field in row_type.elements}
+
+        def parse_row(element: t.Any) -> dict:
+            values = dict.fromkeys(names)
+            for child in element:
+                field = fields.get(child.tag)
+                if field is None:
+                    continue
+                name, field = field
+                text = child.text
+                if child.attrib:
+                    # xsi:nil or xsi:type, leave these to zeep
+                    values[name] = field.parse(child, schema)
+                elif text is not None:
+                    try:
+                        values[name] = field.type.pythonvalue(text)
+                    except (TypeError, ValueError):
+                        # zeep logs the error and returns None
+                        values[name] = field.parse(child, schema)
+            return values
+
+        self._row_parsers[row_name] = parse_row
+        return parse_row
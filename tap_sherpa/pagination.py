@@ -1,13 +1,63 @@
 """Pagination utilities for tap-sherpa."""
 
+from collections import deque
+import copy
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Callable, Dict, Iterable, List, Optional, Union, Generator
+from typing import Any, Callable, ClassVar, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union, Generator
+import queue
+import random
+import threading
 import time
-from tenacity import retry, stop_after_attempt, wait_exponential
 
-from singer_sdk import typing as th
-from tap_sherpa.streams import SherpaStream
+from singer_sdk.singerlib import StateMessage
+
 from tap_sherpa.client import SherpaClient
+from tap_sherpa.streams import SherpaStream
+
+
+# (record field, SOAP response field) pair, optionally followed by a caster
+# applied to values that are not None
+FieldMapEntry = Union[Tuple[str, str], Tuple[str, str, Callable[[Any], Any]]]
+
+
+def _compile_record_mapper(
+    field_map: Tuple[FieldMapEntry, ...],
+    constant_fields: Optional[Dict[str, Any]] = None,
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Compile a function mapping a response item to a record for one stream.
+
+    The generated function returns a single dict display with the field names
+    baked in, which skips the per-field loop of a comprehension. Only the
+    ``repr`` of field names is written into the generated source; casters are
+    passed in through the function's globals.
+
+    Args:
+        field_map: Field map entries of the stream
+        constant_fields: Record fields with a fixed value
+
+    Returns:
+        A function taking a response item and returning the mapped record
+    """
+    casters = []
+    entries = []
+    for key, soap_key, *cast in field_map:
+        if cast:
+            casters.append(cast[0])
+            entries.append(
+                f"{key!r}: None if (value := get({soap_key!r})) is None else casters[{len(casters) - 1}](value)"
+            )
+        else:
+            entries.append(f"{key!r}: get({soap_key!r})")
+    entries += [f"{key!r}: constants[{key!r}]" for key in constant_fields or {}]
+    source = f"def map_record(item):\n    get = item.get\n    return {{{', '.join(entries)}}}\n"
+    namespace: Dict[str, Any] = {"constants": dict(constant_fields or {}), "casters": casters}
+    exec(compile(source, "<tap_sherpa record mapper>", "exec"), namespace)
+    return namespace["map_record"]
+
+
+# Page size the auto-ramp starts from when state has no last-known-good size
+RAMP_START_PAGE_SIZE = 500
 
 
 class PaginationMode(str, Enum):
@@ -18,36 +68,63 @@ class PaginationMode(str, Enum):
     OFFSET = "offset"
 
 
-class PaginationConfig:
-    """Configuration for pagination."""
+class PaginationConfig(NamedTuple):
+    """Configuration for pagination.
 
-    def __init__(
-        self,
-        chunk_size: int = 1000,
-        max_retries: int = 3,
-        retry_wait_min: int = 4,
-        retry_wait_max: int = 10,
-        mode: PaginationMode = PaginationMode.TOKEN,
-    ):
-        """Initialize pagination config.
+    Attributes:
+        chunk_size: Number of records to process in each chunk
+        max_retries: Maximum number of retry attempts
+        retry_wait_min: Minimum wait time between retries in seconds
+        retry_wait_max: Maximum wait time between retries in seconds
+        mode: Pagination mode to use (TOKEN, CURSOR, or OFFSET)
+        state_flush_pages: Number of pages to process between state messages
+        state_flush_interval: Seconds after which a state message is written
+            at the next page, even if state_flush_pages was not reached
+    """
 
-        Args:
-            chunk_size: Number of records to process in each chunk
-            max_retries: Maximum number of retry attempts
-            retry_wait_min: Minimum wait time between retries in seconds
-            retry_wait_max: Maximum wait time between retries in seconds
-            mode: Pagination mode to use (TOKEN, CURSOR, or OFFSET)
-        """
-        self.chunk_size = chunk_size
-        self.max_retries = max_retries
-        self.retry_wait_min = retry_wait_min
-        self.retry_wait_max = retry_wait_max
-        self.mode = mode
+    chunk_size: int = 1000
+    max_retries: int = 3
+    retry_wait_min: int = 4
+    retry_wait_max: int = 10
+    mode: PaginationMode = PaginationMode.TOKEN
+    state_flush_pages: int = 10
+    state_flush_interval: float = 60
 
 
 class PaginatedStream(SherpaStream):
     """Base class for streams with pagination support."""
 
+    # Pages are emitted in ascending token order, so the bookmark in each state
+    # message is resumable rather than a progress marker
+    is_sorted = True
+    # Keys of response_path, set for each stream class that defines one
+    response_path_parts: Tuple[str, ...] = ()
+    # How response fields map to record fields, None for streams without records
+    field_map: ClassVar[Optional[Tuple[FieldMapEntry, ...]]] = None
+    # Record fields with a fixed value, for data missing from the SOAP response
+    constant_fields: ClassVar[Optional[Dict[str, Any]]] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Install a compiled map_record on streams that set a field map or constant fields.
+
+        A subclass that overrides only one of the two is recompiled with the
+        other taken from its parent. Streams that define their own map_record
+        keep it. The stream's response_path is split into response_path_parts
+        here, once per class.
+
+        Args:
+            **kwargs: Keyword arguments to pass to parent class
+        """
+        super().__init_subclass__(**kwargs)
+        if "response_path" in cls.__dict__:
+            cls.response_path_parts = tuple(cls.response_path.split("."))
+        if "map_record" not in cls.__dict__ and (
+            "field_map" in cls.__dict__ or "constant_fields" in cls.__dict__
+        ):
+            field_map = getattr(cls, "field_map")
+            if field_map is not None:
+                cls.map_record = staticmethod(_compile_record_mapper(field_map, cls.constant_fields))
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         """Initialize the stream.
 
@@ -63,101 +140,47 @@ class PaginatedStream(SherpaStream):
             retry_wait_min=self.config.get("retry_wait_min", 4),
             retry_wait_max=self.config.get("retry_wait_max", 10),
             mode=PaginationMode.TOKEN,  # All streams use token-based pagination
+            state_flush_pages=self.config.get("state_flush_pages", 10),
+            state_flush_interval=self.config.get("state_flush_interval", 60),
         )
-        # Initialize SherpaClient for SOAP requests
-        self.client = SherpaClient(
-            wsdl_url=self.config["wsdl_url"],
-            tap=self._tap,
-        )
+        self._pages_since_flush = 0
+        self._last_state_flush = time.monotonic()
+        # Copy of this stream's bookmark as of the last state message
+        self._last_emitted_bookmark: Optional[dict] = None
+        # Service parameters that stay constant for the whole sync, as strings;
+        # the client adds the security code to every call
+        self._base_service_params: Dict[str, str] = {}
+        self._page_size_param: Optional[str] = None
+        if self.name in [
+            "changed_orders",
+            "changed_parcels",
+            "changed_purchases",
+            "changed_suppliers",
+            "changed_item_suppliers",
+        ]:
+            self._page_size_param = "count"
+        elif self.name == "changed_stock":
+            self._page_size_param = "maxResult"
+        # For changed_items, do not add count or maxResult
+        if self._page_size_param:
+            self._base_service_params[self._page_size_param] = str(
+                self.config.get(f"{self.name}_per_request", 2500)
+            )
+        self._page_size_settled = False
 
     def map_record(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Map a response item to a record.
 
+        Streams with a field map replace this with a compiled mapper, see
+        ``__init_subclass__``; this fallback only runs for streams without one.
+
         Args:
             item: The response item to map
 
         Returns:
-            The mapped record
+            None, streams without a field map have no records
         """
-        # Get the field names from the schema
-        schema_props = self.schema.get("properties", {})
-        field_names = list(schema_props.keys())
-
-        # Map the record based on the stream type
-        if self.name == "changed_items":
-            return {
-                "item_code": item.get("ItemCode"),
-                "token": item.get("Token"),
-                "item_status": item.get("ItemStatus"),
-            }
-        elif self.name == "changed_orders":
-            return {
-                "order_number": item.get("OrderNumber"),
-                "token": item.get("Token"),
-                "order_status": item.get("OrderStatus"),
-                "warehouse_code": item.get("WarehouseCode"),
-            }
-        elif self.name == "changed_suppliers":
-            return {
-                "supplier_code": item.get("ClientCode"),
-                "token": item.get("Token"),
-                "supplier_status": "Active",  # Default status since it's not in the response
-            }
-        elif self.name == "changed_item_suppliers":
-            return {
-                "supplier_code": item.get("SupplierCode"),
-                "supplier_item_code": item.get("SupplierItemCode"),
-                "item_code": item.get("ItemCode"),
-                "supplier_description": item.get("SupplierDescription"),
-                "supplier_stock": item.get("SupplierStock"),
-                "supplier_price": item.get("SupplierPrice"),
-                "preferred": item.get("Preferred"),
-                "token": item.get("Token"),
-                "available_from": item.get("AvailableFrom"),
-                "supplier_item_status": item.get("SupplierItemStatus"),
-                "last_modified": item.get("LastModified"),
-                "min_purchase_qty": item.get("MinPurchaseQty"),
-                "supplier_purchase_qty": item.get("SupplierPurchaseQty"),
-                "supplier_purchase_qty_multiplier": item.get("SupplierPurchaseQtyMultiplier"),
-            }
-        elif self.name == "changed_purchases":
-            return {
-                "purchase_code": item.get("PurchaseCode"),
-                "order_number": item.get("OrderNumber"),
-                "token": item.get("Token"),
-                "purchase_status": item.get("PurchaseStatus"),
-                "warehouse_code": item.get("WarehouseCode"),
-            }
-        elif self.name == "changed_parcels":
-            return {
-                "parcel_code": item.get("ParcelCode"),
-                "token": item.get("Token"),
-                "barcode": item.get("Barcode"),
-                "order_number": item.get("OrderNumber"),
-                "parcel_service_code": item.get("ParcelServiceCode"),
-                "parcel_type_code": item.get("ParcelTypeCode"),
-                "track_trace_url": item.get("TrackTraceUrl"),
-            }
-        elif self.name == "changed_stock":
-            return {
-                "item_code": item.get("ItemCode"),
-                "available": item.get("Available"),
-                "stock": item.get("Stock"),
-                "reserved": item.get("Reserved"),
-                "item_status": item.get("ItemStatus"),
-                "token": item.get("Token"),
-                "expected_date": item.get("ExpectedDate"),
-                "qty_waiting_to_receive": item.get("QtyWaitingToReceive"),
-                "first_expected_date": item.get("FirstExpectedDate"),
-                "first_expected_qty_waiting_to_receive": item.get("FirstExpectedQtyWaitingToReceive"),
-                "last_modified": item.get("LastModified"),
-                "avg_purchase_price": item.get("AvgPurchasePrice"),
-                "warehouse_code": item.get("WarehouseCode"),
-                "cost_price": item.get("CostPrice"),
-            }
-        else:
-            # For unknown streams, return None
-            return None
+        return None
 
     def _get_state(self) -> Dict[str, Any]:
         """Get the current state with additional metadata.
@@ -195,10 +218,70 @@ class PaginatedStream(SherpaStream):
         super()._increment_stream_state(record, context=context)
         self._total_records += 1
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
+    def _checkpoint_page(self) -> None:
+        """Count a page whose state was incremented and write state when due.
+
+        State is written every state_flush_pages pages, or at the first page
+        after state_flush_interval seconds without a state message.
+        """
+        self._pages_since_flush += 1
+        config = self._pagination_config
+        if (
+            self._pages_since_flush >= config.state_flush_pages
+            or time.monotonic() - self._last_state_flush >= config.state_flush_interval
+        ):
+            self._flush_state()
+
+    def _flush_state(self) -> None:
+        """Write a state message if pages were checkpointed since the last one."""
+        if self._pages_since_flush:
+            self._write_state_message()
+            self._pages_since_flush = 0
+            self._last_state_flush = time.monotonic()
+
+    def _write_state_message(self) -> None:
+        """Write a state message if this stream's bookmark changed since the last one.
+
+        The message still carries the full tap state, but only this stream's
+        bookmark is compared with and copied from the last message; the
+        bookmarks of other streams only change while those streams sync.
+        """
+        if self._is_state_flushed or not self.tap_state:
+            return
+        bookmark = self.stream_state
+        if bookmark == self._last_emitted_bookmark:
+            return
+        self._tap.write_message(StateMessage(value=self.tap_state))
+        self._last_emitted_bookmark = copy.deepcopy(bookmark)
+        self._is_state_flushed = True
+
+    def _retry(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call a function, retrying with exponential backoff on failure.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments to pass to the function
+            **kwargs: Keyword arguments to pass to the function
+
+        Returns:
+            The function's return value
+
+        Raises:
+            Exception: If the call fails after all retries
+        """
+        config = self._pagination_config
+        attempts = max(1, config.max_retries)
+        for attempt in range(attempts):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt == attempts - 1:
+                    self.logger.error("Error making request: %s", e)
+                    raise
+                wait = min(config.retry_wait_max, config.retry_wait_min * 2 ** attempt) + random.random()
+                self.logger.warning("Request failed (%s), retrying in %.1fs", e, wait)
+                time.sleep(wait)
+
     def _make_request(self, service_name: str, stream_name: str = None, **params: Any) -> Dict[str, Any]:
         """Make a request with retry logic.
 
@@ -213,11 +296,63 @@ class PaginatedStream(SherpaStream):
         Raises:
             Exception: If the request fails after all retries
         """
-        try:
-            return self.client.call_service(service_name, stream_name=stream_name, **params)
-        except Exception as e:
-            self.logger.error(f"Error making request: {str(e)}")
-            raise
+        return self._retry(self.client.call_service, service_name, stream_name=stream_name, **params)
+
+    def _request_records(
+        self, client: SherpaClient, service_name: str, response_path: Tuple[str, ...], **params: Any
+    ) -> Tuple[int, List[Dict[str, Any]], float]:
+        """Request a page and map its rows to records, with retry logic.
+
+        Args:
+            client: The stream's SOAP client
+            service_name: Name of the service to call
+            response_path: Keys leading from the result to the rows
+            **params: Parameters to pass to the service
+
+        Returns:
+            Tuple of the response time, the mapped records with their response_time
+            set, and the request latency in seconds
+
+        Raises:
+            Exception: If the request fails after all retries
+        """
+        started = time.monotonic()
+        response_time, records = self._retry(
+            client.call_service_rows,
+            service_name,
+            response_path,
+            self.map_record,
+            stream_name=self.name,
+            **params,
+        )
+        latency = time.monotonic() - started
+        # Finish the records on the fetching thread, so a page is yielded as is
+        records = [record for record in records if record]
+        for record in records:
+            record["response_time"] = response_time
+        return response_time, records, latency
+
+    def _next_page_size(self, page_size: int, max_page_size: int, latency: float) -> int:
+        """Get the page size for the next request when auto-ramping.
+
+        The size doubles up to max_page_size until a request takes longer than
+        the latency budget, then backs off by 25% and stops growing. It never
+        backs off below the ramp's starting size.
+
+        Args:
+            page_size: Page size of the last request
+            max_page_size: Largest page size to request
+            latency: Latency of the last request in seconds
+
+        Returns:
+            Page size for the next request
+        """
+        if latency > self.config.get("page_size_latency_budget", 10):
+            self._page_size_settled = True
+            return max(min(RAMP_START_PAGE_SIZE, max_page_size), int(page_size * 0.75))
+        if self._page_size_settled:
+            return page_size
+        return min(max_page_size, page_size * 2)
 
     def get_records_with_pagination(
         self,
@@ -238,7 +373,7 @@ class PaginatedStream(SherpaStream):
             yield from self.get_records_with_token(
                 service_name=service_name,
                 token_param_name="token",
-                response_path=self.response_path,
+                response_path=self.response_path_parts,
                 context=context,
                 **service_params,
             )
@@ -259,7 +394,7 @@ class PaginatedStream(SherpaStream):
         self,
         service_name: str,
         token_param_name: str,
-        response_path: str,
+        response_path: Union[str, Tuple[str, ...]],
         context: Optional[dict] = None,
         **call_params,
     ) -> Generator[Dict[str, Any], None, None]:
@@ -268,7 +403,7 @@ class PaginatedStream(SherpaStream):
         Args:
             service_name: Name of the SOAP service to call
             token_param_name: Name of the token parameter in the SOAP call
-            response_path: Path to the response items in the response dict (dot-separated string)
+            response_path: Path to the response items in the response dict, as a dot-separated string or its keys
             **call_params: Additional parameters to pass to the SOAP call
 
         Yields:
@@ -279,55 +414,222 @@ class PaginatedStream(SherpaStream):
         if last_token is None:
             last_token = 1
 
-        self.logger.info(f"[{self.name}] Starting sync with token: {last_token}")
+        self.logger.info("[%s] Starting sync with token: %s", self.name, last_token)
 
-        while True:
-            # 2. Make request using current token
-            call_params[token_param_name] = last_token
-            response = self._make_request(service_name, stream_name=self.name, **call_params)
-            response_time = response.get("ResponseTime", 0)
-
-            # 3. Extract items from response
-            items = response
-            for part in response_path.split('.'):
-                if isinstance(items, dict):
-                    items = items.get(part, {})
+        if isinstance(response_path, str):
+            path_parts = tuple(response_path.split("."))
+        else:
+            path_parts = tuple(response_path)
+
+        # A producer thread fetches up to prefetch_pages pages ahead of the
+        # records being emitted; the bounded queue holds it back when it is
+        # further ahead than that
+        pages: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, self.config.get("prefetch_pages", 2)))
+        stop = threading.Event()
+        call_params[token_param_name] = str(last_token)
+        # Build the client on this thread, so the fetch threads don't race to build it
+        client = self.client
+        producer = threading.Thread(
+            target=self._produce_pages,
+            args=(client, pages, stop, service_name, path_parts, token_param_name, last_token, call_params),
+            name=f"{self.name}-fetch",
+            daemon=True,
+        )
+        producer.start()
+
+        try:
+            while True:
+                page = pages.get()
+                if page is None:
+                    break
+                if isinstance(page, BaseException):
+                    raise page
+                records, highest_token, good_page_size = page
+
+                # Yield records while the following pages are fetched
+                yield from records
+
+                # State is only modified here, the producer hands the page size over
+                if good_page_size is not None:
+                    self.stream_state["page_size"] = good_page_size
+
+                # Update state with the token of the emitted page
+                if highest_token > 0:
+                    next_token = str(highest_token)
+                    self.logger.info(
+                        "[%s] Token progression: %s -> %s (batch size: %d)",
+                        self.name, last_token, next_token, len(records),
+                    )
+                    last_token = next_token
+                    self._increment_stream_state(last_token)
+                    self._checkpoint_page()
                 else:
-                    items = {}
-            
-            if not items or items == {}:
-                self.logger.info(f"[{self.name}] Empty response, stopping pagination")
-                break
+                    self.logger.info("[%s] No valid tokens found in response, stopping pagination", self.name)
+                    break
+        finally:
+            # Let the producer exit if the sync stopped before the last page
+            stop.set()
+            producer.join()
+            # Checkpoint the pages emitted so far, also when the sync failed
+            self._flush_state()
+
+    def _produce_pages(
+        self,
+        client: SherpaClient,
+        pages: "queue.Queue[Any]",
+        stop: threading.Event,
+        service_name: str,
+        path_parts: Tuple[str, ...],
+        token_param_name: str,
+        last_token: str,
+        call_params: Dict[str, Any],
+    ) -> None:
+        """Fetch pages in token order and put them on a queue until the last page.
+
+        With ``concurrency`` above 1, up to that many token windows are
+        requested at once. Once a page has returned, the next windows are
+        requested speculatively. Each probe token follows the previous one by
+        the average token distance between the rows of the last page, times
+        the page size the previous window was requested with. They
+        are drained in order, and the records of each window that were already
+        emitted are skipped. The records of each page are sorted by token. A window whose probe token is past the highest
+        token seen so far may have skipped records; it is discarded and the
+        window is requested again from that highest token.
+
+        Each page is queued as a (records, highest token, page size) tuple,
+        where the page size is the last auto-ramped size that stayed within
+        the latency budget, or None when there is none to store in state. The
+        end of the pages is marked with None, a failed request with the
+        exception it raised.
 
-            # Ensure items is a list
-            if not isinstance(items, list):
-                items = []
+        Args:
+            client: The stream's SOAP client
+            pages: Bounded queue the pages are put on
+            stop: Event set by the consumer when it no longer reads pages
+            service_name: Name of the SOAP service to call
+            path_parts: Keys leading from the result to the rows
+            token_param_name: Name of the token parameter in the SOAP call
+            last_token: Token the first page is requested with
+            call_params: Parameters to pass to the SOAP call, including the token
+        """
+        concurrency = max(1, self.config.get("concurrency", 1))
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"{self.name}-window")
+        # (probe token, requested page size, future) of the windows in flight, in token order
+        windows: "deque[Tuple[int, Optional[int], Future]]" = deque()
+        ramp_param = self._page_size_param if self.config.get("auto_ramp_page_size") else None
+        # Average distance between the tokens of consecutive rows
+        token_gap = 1.0
+
+        def submit(token: int) -> None:
+            params = {**call_params, token_param_name: str(token)}
+            requested = int(params[self._page_size_param]) if self._page_size_param else None
+            future = executor.submit(self._request_records, client, service_name, path_parts, **params)
+            windows.append((token, requested, future))
+
+        try:
+            # Ramp the page size from the last-known-good size in state
+            if ramp_param:
+                max_page_size = int(call_params[ramp_param])
+                page_size = min(max_page_size, int(self.stream_state.get("page_size", RAMP_START_PAGE_SIZE)))
+                call_params[ramp_param] = str(page_size)
+                self._page_size_settled = False
+            good_page_size: Optional[int] = None
 
-            # 4. Process items and find highest token
             highest_token = int(last_token)
-            for item in items:
-                # Get token before mapping record
-                item_token = int(item.get("Token", 0))
-                if item_token > highest_token:
-                    highest_token = item_token
-
-                # Map and yield record
-                record = self.map_record(item)
-                if record:
-                    record["response_time"] = response_time
-                    yield record
-
-            # 5. Update token for next request
-            if highest_token > 0:
+            submit(highest_token)
+            while not stop.is_set():
+                probe_token, requested, future = windows.popleft()
+                # Rows are mapped to records while the response is parsed
+                _, records, latency = future.result()
+
+                if probe_token > highest_token:
+                    # Records between the highest token and the probe token were never requested
+                    self.logger.debug(
+                        "[%s] Window at token %s is past the highest token %s, requesting it again",
+                        self.name, probe_token, highest_token,
+                    )
+                    for _, _, window in windows:
+                        window.cancel()
+                    windows.clear()
+                    submit(highest_token)
+                    continue
+
+                if not records:
+                    self.logger.info("[%s] Empty response, stopping pagination", self.name)
+                    break
+
+                if ramp_param:
+                    # Windows in flight may have been requested with an earlier page size,
+                    # ramp from the size this one was requested with
+                    if latency <= self.config.get("page_size_latency_budget", 10):
+                        good_page_size = requested
+                    next_page_size = self._next_page_size(requested, max_page_size, latency)
+                    if self._page_size_settled:
+                        # A window requested before the back-off doesn't grow the size again
+                        next_page_size = min(page_size, next_page_size)
+                    page_size = next_page_size
+                    call_params[ramp_param] = str(page_size)
+
+                # Find the highest token, the next page is requested with it
+                tokens = [int(record["token"]) for record in records if record and record["token"] is not None]
+                page_token = max(highest_token, max(tokens, default=0))
+                if len(tokens) > 1:
+                    token_gap = (max(tokens) - min(tokens)) / (len(tokens) - 1)
+
+                # Skip records of a speculative window that the previous window already returned
+                if probe_token < highest_token:
+                    records = [
+                        record for record in records
+                        if record and record["token"] is not None and int(record["token"]) > highest_token
+                    ]
+                # The stream is sorted by token, don't rely on Sherpa returning the rows that way
+                records.sort(key=lambda record: -1 if record["token"] is None else int(record["token"]))
+
+                if page_token <= 0:
+                    self._put_page(pages, stop, (records, page_token, good_page_size))
+                    return
                 # Since API always returns tokens > request token, we can use highest_token directly
-                next_token = str(highest_token)
-                self.logger.info(f"[{self.name}] Token progression: {last_token} -> {next_token} (batch size: {len(items)})")
-                last_token = next_token
-                self._increment_stream_state(last_token)
-                self._write_state_message()
-            else:
-                self.logger.info(f"[{self.name}] No valid tokens found in response, stopping pagination")
-                break
+                highest_token = page_token
+                if not windows:
+                    submit(highest_token)
+                while len(windows) < concurrency:
+                    # A window spans the token gap times its page size less one. The gap
+                    # before its first row is left out, so the windows overlap slightly
+                    # rather than skip past the previous window's last token
+                    previous_token, previous_rows, _ = windows[-1]
+                    rows = previous_rows or len(tokens)
+                    submit(previous_token + max(1, int(token_gap * (rows - 1))))
+
+                if records:
+                    if not self._put_page(pages, stop, (records, highest_token, good_page_size)):
+                        return
+                    good_page_size = None
+        except Exception as e:
+            self._put_page(pages, stop, e)
+            return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._put_page(pages, stop, None)
+
+    @staticmethod
+    def _put_page(pages: "queue.Queue[Any]", stop: threading.Event, page: Any) -> bool:
+        """Put a page on the queue, waiting for room unless the consumer stopped.
+
+        Args:
+            pages: Bounded queue the page is put on
+            stop: Event set by the consumer when it no longer reads pages
+            page: The page, end marker or exception to queue
+
+        Returns:
+            False if the consumer stopped before the page was queued
+        """
+        while not stop.is_set():
+            try:
+                pages.put(page, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
 
     def get_records_with_cursor(
         self,
@@ -352,7 +654,7 @@ class PaginatedStream(SherpaStream):
             # Make the request with retry logic
             response = self._make_request(
                 service_name,
-                **{cursor_param_name: cursor, **service_params}
+                **{cursor_param_name: str(cursor), **service_params}
             )
             
             # Process records
@@ -366,7 +668,9 @@ class PaginatedStream(SherpaStream):
             
             # Update state
             self._increment_stream_state(cursor)
-            self._write_state_message()
+            self._checkpoint_page()
+
+        self._flush_state()
 
     def get_records_with_offset(
         self,
@@ -395,8 +699,8 @@ class PaginatedStream(SherpaStream):
             response = self._make_request(
                 service_name,
                 **{
-                    offset_param_name: offset,
-                    limit_param_name: limit,
+                    offset_param_name: str(offset),
+                    limit_param_name: str(limit),
                     **service_params
                 }
             )
@@ -412,11 +716,13 @@ class PaginatedStream(SherpaStream):
             # Update offset
             offset += len(records)
             self._increment_stream_state(str(offset))
-            self._write_state_message()
+            self._checkpoint_page()
             
             # If we got fewer records than the limit, we're done
             if len(records) < limit:
-                break 
+                break
+
+        self._flush_state()
 
     def get_starting_replication_key_value(self, context: Optional[dict] = None) -> Optional[str]:
         """Get the starting replication key value from state only. Config is not a source of truth."""
@@ -436,23 +742,9 @@ class PaginatedStream(SherpaStream):
             Dictionary objects representing records from the API
         """
         token = self.get_starting_replication_key_value(context)
-        service_params = {
-            "securityCode": self.config["security_code"],
-            "token": token,
-        }
-        if self.name in [
-            "changed_orders",
-            "changed_parcels",
-            "changed_purchases",
-            "changed_suppliers",
-            "changed_item_suppliers",
-        ]:
-            service_params["count"] = str(self.config.get(f"{self.name}_per_request", 500))
-        elif self.name == "changed_stock":
-            service_params["maxResult"] = str(self.config.get(f"{self.name}_per_request", 500))
-        # For changed_items, do not add count or maxResult
         yield from self.get_records_with_pagination(
             service_name=self.service_name,
             context=context,
-            **service_params,
-        ) 
\ No newline at end of file
+            token=str(token),
+            **self._base_service_params,
+        )
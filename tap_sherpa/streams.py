@@ -3,27 +3,28 @@
 from __future__ import annotations
 
 import typing as t
-from importlib import resources
+from functools import cached_property
 
 from singer_sdk import typing as th  # JSON Schema typing helpers
 from singer_sdk.streams import Stream
-from singer_sdk.helpers._state import increment_state
 
 from tap_sherpa.client import SherpaClient
 
-# TODO: Delete this is if not using json files for schema definition
-SCHEMAS_DIR = resources.files(__package__) / "schemas"
-
 
 class SherpaStream(Stream):
     """Base stream class for Sherpa streams."""
 
-    def __init__(self, *args, **kwargs):
-        """Initialize the stream."""
-        super().__init__(*args, **kwargs)
-        self.client = SherpaClient(
+    @cached_property
+    def client(self) -> SherpaClient:
+        """Return the SOAP client, created on first use.
+
+        Returns:
+            A client sharing the tap's zeep client.
+        """
+        return SherpaClient(
             wsdl_url=self.config["wsdl_url"],
             tap=self._tap,
+            zeep_client=self._tap.zeep_client,
         )
 
     def get_records(
@@ -43,7 +44,7 @@ class SherpaStream(Stream):
 
 
 # Import PaginatedStream after SherpaStream is defined to avoid circular imports
-from tap_sherpa.pagination import PaginatedStream, PaginationMode
+from tap_sherpa.pagination import PaginatedStream
 
 
 class ChangedItemsStream(PaginatedStream):
@@ -59,6 +60,11 @@ class ChangedItemsStream(PaginatedStream):
     ).to_dict()
     service_name = "ChangedItems"
     response_path = "ResponseValue.ItemCodeToken"
+    field_map = (
+        ("item_code", "ItemCode"),
+        ("token", "Token"),
+        ("item_status", "ItemStatus"),
+    )
 
 
 class ChangedOrdersStream(PaginatedStream):
@@ -75,6 +81,12 @@ class ChangedOrdersStream(PaginatedStream):
     ).to_dict()
     service_name = "ChangedOrders"
     response_path = "ResponseValue.OrderNumberToken"
+    field_map = (
+        ("order_number", "OrderNumber"),
+        ("token", "Token"),
+        ("order_status", "OrderStatus"),
+        ("warehouse_code", "WarehouseCode"),
+    )
 
 
 class ChangedSuppliersStream(PaginatedStream):
@@ -90,6 +102,13 @@ class ChangedSuppliersStream(PaginatedStream):
     ).to_dict()
     service_name = "ChangedSuppliers"
     response_path = "ResponseValue.ClientCodeToken"
+    field_map = (
+        ("supplier_code", "ClientCode"),
+        ("token", "Token"),
+    )
+    constant_fields = {
+        "supplier_status": "Active",  # Default status since it's not in the response
+    }
 
 
 class ChangedItemSuppliersStream(PaginatedStream):
@@ -116,6 +135,22 @@ class ChangedItemSuppliersStream(PaginatedStream):
     ).to_dict()
     service_name = "ChangedItemSuppliers"
     response_path = "ResponseValue.SupplierItemCodeToken"
+    field_map = (
+        ("supplier_code", "SupplierCode"),
+        ("supplier_item_code", "SupplierItemCode"),
+        ("item_code", "ItemCode"),
+        ("supplier_description", "SupplierDescription"),
+        ("supplier_stock", "SupplierStock"),
+        ("supplier_price", "SupplierPrice"),
+        ("preferred", "Preferred"),
+        ("token", "Token"),
+        ("available_from", "AvailableFrom"),
+        ("supplier_item_status", "SupplierItemStatus"),
+        ("last_modified", "LastModified"),
+        ("min_purchase_qty", "MinPurchaseQty"),
+        ("supplier_purchase_qty", "SupplierPurchaseQty"),
+        ("supplier_purchase_qty_multiplier", "SupplierPurchaseQtyMultiplier"),
+    )
 
 
 class ChangedPurchasesStream(PaginatedStream):
@@ -133,6 +168,13 @@ class ChangedPurchasesStream(PaginatedStream):
     ).to_dict()
     service_name = "ChangedPurchases"
     response_path = "ResponseValue.PurchaseCodeToken"
+    field_map = (
+        ("purchase_code", "PurchaseCode"),
+        ("order_number", "OrderNumber"),
+        ("token", "Token"),
+        ("purchase_status", "PurchaseStatus"),
+        ("warehouse_code", "WarehouseCode"),
+    )
 
 
 class ChangedParcelsStream(PaginatedStream):
@@ -152,6 +194,15 @@ class ChangedParcelsStream(PaginatedStream):
     ).to_dict()
     service_name = "ChangedParcels"
     response_path = "ResponseValue.ParcelCodeToken"
+    field_map = (
+        ("parcel_code", "ParcelCode"),
+        ("token", "Token"),
+        ("barcode", "Barcode"),
+        ("order_number", "OrderNumber"),
+        ("parcel_service_code", "ParcelServiceCode"),
+        ("parcel_type_code", "ParcelTypeCode"),
+        ("track_trace_url", "TrackTraceUrl"),
+    )
 
 
 class ChangedStockStream(PaginatedStream):
@@ -178,3 +229,19 @@ class ChangedStockStream(PaginatedStream):
     ).to_dict()
     service_name = "ChangedStock"
     response_path = "ResponseValue.ItemStockToken"
+    field_map = (
+        ("item_code", "ItemCode"),
+        ("available", "Available"),
+        ("stock", "Stock"),
+        ("reserved", "Reserved"),
+        ("item_status", "ItemStatus"),
+        ("token", "Token"),
+        ("expected_date", "ExpectedDate"),
+        ("qty_waiting_to_receive", "QtyWaitingToReceive"),
+        ("first_expected_date", "FirstExpectedDate"),
+        ("first_expected_qty_waiting_to_receive", "FirstExpectedQtyWaitingToReceive"),
+        ("last_modified", "LastModified"),
+        ("avg_purchase_price", "AvgPurchasePrice"),
+        ("warehouse_code", "WarehouseCode"),
+        ("cost_price", "CostPrice"),
+    )
@@ -1,18 +1,25 @@
 """Sherpa tap class."""
 
 from __future__ import annotations
+from functools import cached_property
 from typing import Optional, Iterable, Dict, Any, List
 
 from singer_sdk import Tap
 from singer_sdk import typing as th  # JSON schema typing helpers
+from zeep import Client
+from zeep.cache import InMemoryCache, SqliteCache
+from zeep.transports import Transport
 
 from tap_sherpa import streams
+from tap_sherpa.client import create_transport, create_zeep_client
+from tap_sherpa.writers import SherpaMessageWriter
 
 
 class TapSherpa(Tap):
     """Sherpa tap class."""
 
     name = "tap-sherpa"
+    message_writer_class = SherpaMessageWriter
 
     config_jsonschema = th.PropertiesList(
         th.Property(
@@ -70,6 +77,66 @@ class TapSherpa(Tap):
             description="Maximum wait time between retries in seconds",
             default=10,
         ),
+        th.Property(
+            "auto_ramp_page_size",
+            th.BooleanType,
+            description=(
+                "Start at 500 records per request and double the page size up to "
+                "the stream's per-request setting until a request exceeds the "
+                "latency budget, then back off by 25%"
+            ),
+            default=False,
+        ),
+        th.Property(
+            "page_size_latency_budget",
+            th.NumberType,
+            description="Request latency in seconds above which the auto-ramped page size backs off",
+            default=10,
+        ),
+        th.Property(
+            "state_flush_pages",
+            th.IntegerType,
+            description="Number of pages to process between state messages",
+            default=10,
+        ),
+        th.Property(
+            "state_flush_interval",
+            th.NumberType,
+            description=(
+                "Seconds after which a state message is written at the next page, "
+                "even if state_flush_pages pages were not processed yet"
+            ),
+            default=60,
+        ),
+        th.Property(
+            "prefetch_pages",
+            th.IntegerType,
+            description="Number of pages fetched ahead of the records being emitted",
+            default=2,
+        ),
+        th.Property(
+            "concurrency",
+            th.IntegerType,
+            description=(
+                "Number of token windows requested at once per stream; windows "
+                "after the first are requested speculatively and drained in order"
+            ),
+            default=1,
+        ),
+        th.Property(
+            "wsdl_cache_path",
+            th.StringType,
+            description=(
+                "Path of a SQLite file caching the downloaded WSDL and XSD documents "
+                "across runs; they are only cached in memory when unset"
+            ),
+        ),
+        th.Property(
+            "wsdl_cache_ttl",
+            th.IntegerType,
+            description="Seconds a WSDL or XSD document stays valid in the wsdl_cache_path cache",
+            default=86400,
+        ),
         th.Property(
             "stream_tokens",
             th.ObjectType(
@@ -83,6 +150,31 @@ class TapSherpa(Tap):
         ),
     ).to_dict()
 
+    @cached_property
+    def transport(self) -> Transport:
+        """Return the SOAP transport shared by all streams.
+
+        Returns:
+            A transport over one keep-alive session, sized for the configured concurrency.
+        """
+        concurrency = self.config.get("concurrency", 1)
+        cache_path = self.config.get("wsdl_cache_path")
+        if cache_path:
+            # Reuse the downloaded WSDL and XSD documents across runs
+            cache = SqliteCache(path=cache_path, timeout=self.config.get("wsdl_cache_ttl", 86400))
+        else:
+            cache = InMemoryCache()
+        return create_transport(pool_maxsize=max(8, concurrency * 2), pool_block=True, cache=cache)
+
+    @cached_property
+    def zeep_client(self) -> Client:
+        """Return the zeep client shared by all streams.
+
+        Returns:
+            A client over the shared transport, parsing the WSDL once per tap.
+        """
+        return create_zeep_client(self.config["wsdl_url"], self.transport)
+
     def discover_streams(self) -> List[streams.SherpaStream]:
         """Return a list of discovered streams.
 
@@ -0,0 +1,35 @@
+"""Singer message writers for tap-sherpa."""
+
+from __future__ import annotations
+
+import sys
+
+from singer_sdk.io_base import SingerWriter
+from singer_sdk.singerlib import SingerMessageType
+
+try:
+    from singer_sdk.contrib.msgspec import MsgSpecWriter
+except ImportError:  # msgspec is optional, install the "msgspec" extra
+    MsgSpecWriter = None
+
+
+if MsgSpecWriter is not None:
+
+    class SherpaMessageWriter(MsgSpecWriter):
+        """Write Singer messages as bytes, flushing stdout only after non-RECORD messages."""
+
+        def write_message(self, message) -> None:
+            """Write a message to stdout.
+
+            RECORD messages stay in the stdout buffer until the next SCHEMA or
+            STATE message, so a STATE line is never flushed ahead of its records.
+
+            Args:
+                message: The message to write.
+            """
+            sys.stdout.buffer.write(self.format_message(message))
+            if message.type != SingerMessageType.RECORD:
+                sys.stdout.flush()
+
+else:
+    SherpaMessageWriter = SingerWriter
@@ -0,0 +1,133 @@
+"""Tests for the SOAP client, against canned responses."""
+
+from __future__ import annotations
+
+import typing as t
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+
+from tap_sherpa.client import SherpaClient, as_dict, create_transport
+
+WSDL = str(Path(__file__).parent / "sherpa.wsdl")
+
+ENVELOPE = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<soap:Envelope xmlns:soap="http://www.w3.org/2003/05/soap-envelope"'
+    ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+    "<soap:Body>{}</soap:Body></soap:Envelope>"
+)
+
+STOCK_RESPONSE = ENVELOPE.format(
+    '<ChangedStockResponse xmlns="http://sherpa.sherpaan.nl/"><ChangedStockResult>'
+    "<ResponseTime>7</ResponseTime><ResponseValue>"
+    "<ItemStockToken><ItemCode>I1</ItemCode><Available>3</Available>"
+    # Elements with attributes are left to zeep
+    '<Stock xmlns:s="http://www.w3.org/2001/XMLSchema" xsi:type="s:int">5</Stock>'
+    "<Token>11</Token><AvgPurchasePrice>1.50</AvgPurchasePrice><WarehouseCode>W&amp;1</WarehouseCode>"
+    "</ItemStockToken>"
+    # No ItemCode, a nil Available and an element the WSDL does not define
+    '<ItemStockToken><Available xsi:nil="true"/><Stock>0</Stock><Token>12</Token>'
+    "<AvgPurchasePrice>0</AvgPurchasePrice><Unknown>x</Unknown></ItemStockToken>"
+    "</ResponseValue></ChangedStockResult></ChangedStockResponse>"
+)
+
+SUPPLIERS_RESPONSE = ENVELOPE.format(
+    '<ChangedSuppliersResponse xmlns="http://sherpa.sherpaan.nl/"><ChangedSuppliersResult>'
+    "<ResponseTime>9</ResponseTime><ResponseValue>"
+    "<ClientCodeToken><ClientCode>S1</ClientCode><Token>21</Token></ClientCodeToken>"
+    "<ClientCodeToken><ClientCode>S2</ClientCode><Token>22</Token></ClientCodeToken>"
+    "</ResponseValue></ChangedSuppliersResult></ChangedSuppliersResponse>"
+)
+
+
+class CannedAdapter(HTTPAdapter):
+    """Answer every request with the same SOAP response."""
+
+    def __init__(self, content: str) -> None:
+        super().__init__()
+        self.content = content.encode()
+        self.requests: t.List[PreparedRequest] = []
+
+    def send(self, request: PreparedRequest, **kwargs: t.Any) -> Response:
+        self.requests.append(request)
+        response = Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response.headers["Content-Type"] = "application/soap+xml; charset=utf-8"
+        response._content = self.content
+        return response
+
+
+def make_client(content: str) -> t.Tuple[SherpaClient, CannedAdapter]:
+    """Create a client loading the test WSDL and answering calls with a canned response.
+
+    Returns:
+        The client and the adapter serving the response
+    """
+    transport = create_transport()
+    adapter = CannedAdapter(content)
+    transport.session.mount("https://", adapter)
+    tap = SimpleNamespace(config={"security_code": "test"})
+    return SherpaClient(WSDL, tap=tap, transport=transport), adapter
+
+
+def test_row_parser_converts_fields_like_zeep() -> None:
+    client, adapter = make_client(STOCK_RESPONSE)
+
+    response_time, rows = client.call_service_rows(
+        "ChangedStock", ("ResponseValue", "ItemStockToken"), dict, token="10", maxResult="2"
+    )
+
+    assert response_time == 7
+    assert rows == [
+        {
+            "ItemCode": "I1",
+            "Available": 3,
+            "Stock": 5,
+            "Token": 11,
+            "AvgPurchasePrice": Decimal("1.50"),
+            "WarehouseCode": "W&1",
+        },
+        {
+            "ItemCode": None,
+            "Available": None,
+            "Stock": 0,
+            "Token": 12,
+            "AvgPurchasePrice": Decimal("0"),
+            "WarehouseCode": None,
+        },
+    ]
+    # Same values as zeep's own parser, which also keeps undefined elements in _raw_elements
+    result = client.call_service("ChangedStock", token="10", maxResult="2")
+    zeep_rows = as_dict(result["ResponseValue"])["ItemStockToken"]
+    assert rows == [{name: row[name] for name in rows[0]} for row in zeep_rows]
+    assert b"<ns0:securityCode>test</ns0:securityCode>" in adapter.requests[0].body
+
+
+def test_row_parser_falls_back_to_call_service_without_row_type() -> None:
+    # The WSDL names the row type SupplierToken, not after its ClientCodeToken element
+    client, _ = make_client(SUPPLIERS_RESPONSE)
+
+    response_time, rows = client.call_service_rows(
+        "ChangedSuppliers",
+        ("ResponseValue", "ClientCodeToken"),
+        lambda row: (row["ClientCode"], row["Token"]),
+        token="20",
+        count="2",
+    )
+
+    assert client._row_parsers["ClientCodeToken"] is None
+    assert response_time == 9
+    assert rows == [("S1", 21), ("S2", 22)]
+
+
+@pytest.mark.parametrize("row_name", ["ItemStockToken", "ClientCodeToken"])
+def test_row_parser_is_built_once(row_name: str) -> None:
+    client, _ = make_client(STOCK_RESPONSE)
+    assert client._get_row_parser(row_name) is client._get_row_parser(row_name)
@@ -0,0 +1,346 @@
+"""Tests for paginated streams: record mapping, retries, state and token pagination."""
+
+from __future__ import annotations
+
+import copy
+import logging
+import random
+import threading
+import time
+import typing as t
+
+import pytest
+
+from singer_sdk.singerlib import RecordMessage, StateMessage
+
+# streams imports pagination once SherpaStream is defined
+from tap_sherpa.streams import ChangedStockStream, ChangedSuppliersStream, PaginatedStream
+from tap_sherpa.tap import TapSherpa
+
+PAGE_SIZE = 25
+
+TOKEN_SETS = {
+    "dense": list(range(2, 102)),
+    # Three apart, with a gap of two between the start token and the first token
+    "spaced": list(range(3, 303, 3)),
+    "sparse": sorted(random.Random(3).sample(range(2, 2000), 100)),
+    # Three full pages, the window after them is empty
+    "empty_final_window": list(range(2, 2 + 3 * PAGE_SIZE)),
+}
+
+
+class FakeClient:
+    """Serve ChangedStock pages from a fixed, sorted list of tokens."""
+
+    def __init__(self, tokens: t.List[int], reverse_rows: bool = False) -> None:
+        self.tokens = sorted(tokens)
+        # Return the rows of each page in descending token order
+        self.reverse_rows = reverse_rows
+        # (requested token, number of rows returned) per call
+        self.calls: t.List[t.Tuple[int, int]] = []
+        # Requested page size per call
+        self.page_sizes: t.List[int] = []
+        self._lock = threading.Lock()
+
+    def call_service_rows(
+        self,
+        service_name: str,
+        response_path: t.Sequence[str],
+        row_mapper: t.Callable[[dict], t.Any],
+        stream_name: str = None,
+        **kwargs,
+    ) -> t.Tuple[int, list]:
+        token, count = int(kwargs["token"]), int(kwargs["maxResult"])
+        rows = [
+            {"ItemCode": f"I{tok}", "Token": tok, "WarehouseCode": "W1"}
+            for tok in self.tokens
+            if tok > token
+        ][:count]
+        if self.reverse_rows:
+            rows.reverse()
+        with self._lock:
+            self.calls.append((token, len(rows)))
+            self.page_sizes.append(count)
+        return 7, [row_mapper(row) for row in rows]
+
+
+def make_stream(client: FakeClient, concurrency: int, **config: t.Any) -> ChangedStockStream:
+    """Create a changed_stock stream reading from a fake client.
+
+    Returns:
+        The stream
+    """
+    tap = TapSherpa(
+        config={
+            "security_code": "test",
+            "changed_stock_per_request": PAGE_SIZE,
+            "concurrency": concurrency,
+            **config,
+        },
+        state={},
+    )
+    stream = tap.streams["changed_stock"]
+    stream.client = client
+    return stream
+
+
+def sync_tokens(tokens: t.List[int], concurrency: int) -> t.Tuple[t.List[int], FakeClient]:
+    """Read the changed_stock records served by a fake client.
+
+    Returns:
+        The emitted tokens, in order, and the fake client
+    """
+    client = FakeClient(tokens)
+    stream = make_stream(client, concurrency)
+    return [record["token"] for record in stream.get_records(None)], client
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 4])
+@pytest.mark.parametrize("token_set", list(TOKEN_SETS))
+def test_records_in_token_order(token_set: str, concurrency: int) -> None:
+    tokens = TOKEN_SETS[token_set]
+    emitted, _ = sync_tokens(tokens, concurrency)
+    assert emitted == tokens
+
+
+@pytest.mark.parametrize("concurrency", [2, 4])
+@pytest.mark.parametrize("token_set", ["dense", "spaced"])
+def test_speculative_windows_are_used(token_set: str, concurrency: int) -> None:
+    tokens = TOKEN_SETS[token_set]
+    _, serial = sync_tokens(tokens, 1)
+    _, client = sync_tokens(tokens, concurrency)
+
+    # Probe tokens overlap the previous window, so no window with rows is discarded
+    requested = [token for token, _ in client.calls]
+    assert len(requested) == len(set(requested))
+    serial_pages = sum(1 for _, rows in serial.calls if rows)
+    pages = sum(1 for _, rows in client.calls if rows)
+    assert pages <= serial_pages + 1
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 4])
+def test_empty_final_window_ends_sync(concurrency: int) -> None:
+    tokens = TOKEN_SETS["empty_final_window"]
+    _, client = sync_tokens(tokens, concurrency)
+    # The last token was requested, and returned no rows
+    assert (tokens[-1], 0) in client.calls
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_unsorted_pages_are_emitted_in_token_order(concurrency: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    tokens = TOKEN_SETS["dense"]
+    stream = make_stream(FakeClient(tokens, reverse_rows=True), concurrency)
+    messages: t.List[t.Any] = []
+    monkeypatch.setattr(stream._tap, "write_message", messages.append)
+
+    # A sorted stream raises InvalidStreamSortException on a descending token
+    stream.sync()
+
+    assert [m.record["token"] for m in messages if isinstance(m, RecordMessage)] == tokens
+    assert stream.stream_state["replication_key_value"] == tokens[-1]
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_ramp_stores_page_size_within_budget(concurrency: int) -> None:
+    # Requests take one second per 40 rows, the budget allows up to 40 rows
+    client = FakeClient(list(range(2, 1500)))
+    stream = make_stream(
+        client,
+        concurrency,
+        auto_ramp_page_size=True,
+        changed_stock_per_request=100,
+        page_size_latency_budget=1,
+    )
+    stream.stream_state["page_size"] = 10
+    request_records = stream._request_records
+
+    def timed_request_records(client: FakeClient, *args: t.Any, **params: t.Any) -> tuple:
+        response_time, records, _ = request_records(client, *args, **params)
+        return response_time, records, int(params["maxResult"]) / 40
+
+    stream._request_records = timed_request_records
+    page_sizes: t.List[int] = []
+    for _ in stream.get_records(None):
+        page_sizes.append(stream.stream_state["page_size"])
+
+    assert max(page_sizes) == 40
+    assert [count for count in client.page_sizes if count > 40]
+
+
+@pytest.mark.parametrize("concurrency", [2, 4])
+def test_probes_follow_page_size_changes(concurrency: int, caplog: pytest.LogCaptureFixture) -> None:
+    # The page size ramps from 10 to 100 while windows are in flight
+    tokens = list(range(3, 3000, 3))
+    client = FakeClient(tokens)
+    stream = make_stream(client, concurrency, auto_ramp_page_size=True, changed_stock_per_request=100)
+    stream.stream_state["page_size"] = 10
+
+    # The tap's logging setup replaces the root handler caplog relies on
+    stream.logger.addHandler(caplog.handler)
+    caplog.set_level(logging.DEBUG, logger=stream.logger.name)
+    try:
+        emitted = [record["token"] for record in stream.get_records(None)]
+    finally:
+        stream.logger.removeHandler(caplog.handler)
+
+    assert emitted == tokens
+    assert len(set(client.page_sizes)) > 2
+    # Consecutive windows overlap by about one row
+    assert sum(rows for _, rows in client.calls) - len(tokens) <= len(client.calls)
+    # Only the windows past the last token are requested again
+    discarded = [r.args for r in caplog.records if "requesting it again" in r.getMessage()]
+    assert all(highest_token == tokens[-1] for _, _, highest_token in discarded)
+
+
+class InactiveSuppliersStream(ChangedSuppliersStream):
+    constant_fields = {"supplier_status": "Inactive"}
+
+
+class SupplierCodesStream(ChangedSuppliersStream):
+    field_map = (("supplier_code", "ClientCode"),)
+
+
+class CastStockStream(ChangedStockStream):
+    field_map = (("token", "Token", int), ("item_code", "ItemCode", str.upper))
+
+
+def test_compiled_mapper_maps_fields_and_constants() -> None:
+    item = {"ClientCode": "S1", "Token": 5, "Other": "x"}
+    assert ChangedSuppliersStream.map_record(item) == {
+        "supplier_code": "S1",
+        "token": 5,
+        "supplier_status": "Active",
+    }
+    assert ChangedSuppliersStream.map_record({}) == {
+        "supplier_code": None,
+        "token": None,
+        "supplier_status": "Active",
+    }
+
+
+def test_compiled_mapper_is_recompiled_for_subclasses() -> None:
+    item = {"ClientCode": "S1", "Token": 5}
+    assert InactiveSuppliersStream.map_record(item) == {
+        "supplier_code": "S1",
+        "token": 5,
+        "supplier_status": "Inactive",
+    }
+    assert SupplierCodesStream.map_record(item) == {"supplier_code": "S1", "supplier_status": "Active"}
+    # The parent keeps its own mapper
+    assert ChangedSuppliersStream.map_record(item)["supplier_status"] == "Active"
+
+
+def test_compiled_mapper_casts_values_that_are_not_none() -> None:
+    assert CastStockStream.map_record({"Token": "7", "ItemCode": "i1"}) == {"token": 7, "item_code": "I1"}
+    assert CastStockStream.map_record({"Token": None}) == {"token": None, "item_code": None}
+
+
+def test_stream_without_field_map_has_no_records() -> None:
+    stream = make_stream(FakeClient([]), 1)
+    assert PaginatedStream.map_record(stream, {"Token": 1}) is None
+
+
+@pytest.fixture
+def waits(monkeypatch: pytest.MonkeyPatch) -> t.List[float]:
+    """Record retry waits instead of sleeping, without jitter beyond half a second."""
+    waits: t.List[float] = []
+    monkeypatch.setattr(time, "sleep", waits.append)
+    monkeypatch.setattr(random, "random", lambda: 0.5)
+    return waits
+
+
+def failing(failures: int) -> t.Callable[[], str]:
+    """Return a function that raises the given number of times, then returns "ok"."""
+    calls = iter(range(failures + 1))
+
+    def call() -> str:
+        if next(calls) < failures:
+            raise RuntimeError("down")
+        return "ok"
+
+    return call
+
+
+def test_retry_backs_off_exponentially_up_to_the_maximum(waits: t.List[float]) -> None:
+    stream = make_stream(FakeClient([]), 1, max_retries=4, retry_wait_min=4, retry_wait_max=10)
+    assert stream._retry(failing(3)) == "ok"
+    assert waits == [4.5, 8.5, 10.5]
+
+
+def test_retry_raises_after_max_retries(waits: t.List[float]) -> None:
+    stream = make_stream(FakeClient([]), 1, max_retries=2, retry_wait_min=4, retry_wait_max=10)
+    with pytest.raises(RuntimeError, match="down"):
+        stream._retry(failing(2))
+    assert waits == [4.5]
+
+
+def capture_states(stream: PaginatedStream, monkeypatch: pytest.MonkeyPatch) -> t.List[dict]:
+    """Collect the values of the state messages the stream writes.
+
+    Returns:
+        The list the state values are appended to
+    """
+    states: t.List[dict] = []
+
+    def write_message(message: t.Any) -> None:
+        if isinstance(message, StateMessage):
+            # The message carries the live state, a writer serializes it right away
+            states.append(copy.deepcopy(message.value))
+
+    monkeypatch.setattr(stream._tap, "write_message", write_message)
+    return states
+
+
+def emit_page(stream: PaginatedStream, token: int) -> None:
+    """Advance the bookmark as emitting a page of records does, and checkpoint the page."""
+    # Writing the page's records marks the state as not flushed
+    stream._is_state_flushed = False
+    stream._increment_stream_state(token)
+    stream._checkpoint_page()
+
+
+def test_state_is_written_every_state_flush_pages(monkeypatch: pytest.MonkeyPatch) -> None:
+    stream = make_stream(FakeClient([]), 1, state_flush_pages=3, state_flush_interval=3600)
+    states = capture_states(stream, monkeypatch)
+
+    for token in range(2, 9):
+        emit_page(stream, token)
+    assert [state["bookmarks"]["changed_stock"]["replication_key_value"] for state in states] == [4, 7]
+
+    # The pages since the last state message are flushed at the end of the sync
+    stream._flush_state()
+    stream._flush_state()
+    assert [state["bookmarks"]["changed_stock"]["replication_key_value"] for state in states] == [4, 7, 8]
+
+
+def test_state_is_written_after_state_flush_interval(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    stream = make_stream(FakeClient([]), 1, state_flush_pages=100, state_flush_interval=60)
+    states = capture_states(stream, monkeypatch)
+
+    for token, now in enumerate([10, 70, 100, 131], start=2):
+        clock[0] = now
+        emit_page(stream, token)
+    assert [state["bookmarks"]["changed_stock"]["replication_key_value"] for state in states] == [3, 5]
+
+
+def test_state_message_is_skipped_when_the_bookmark_is_unchanged(monkeypatch: pytest.MonkeyPatch) -> None:
+    stream = make_stream(FakeClient([]), 1)
+    # Bookmarks of other streams are written with the stream's own
+    stream._tap_state.setdefault("bookmarks", {})["changed_items"] = {"replication_key_value": 3}
+    states = capture_states(stream, monkeypatch)
+
+    stream._increment_stream_state(5)
+    stream._is_state_flushed = False
+    stream._write_state_message()
+    stream._is_state_flushed = False
+    stream._write_state_message()
+    assert len(states) == 1
+    assert states[0]["bookmarks"]["changed_items"] == {"replication_key_value": 3}
+
+    # The last written bookmark is a copy, later changes to the state are compared against it
+    stream._increment_stream_state(6)
+    stream._is_state_flushed = False
+    stream._write_state_message()
+    assert [state["bookmarks"]["changed_stock"]["replication_key_value"] for state in states] == [5, 6]